@@ -32,9 +32,13 @@ def a_star(_g, _node):
 
     :param _g: The graph on which to run the dfs.
     :param _node: The node from which the A* search begins.
-    :return: The result path and the steps the algorithm made before reaching the goal node.
+    :return: The result path and the steps the algorithm made before reaching the goal node. The path is empty if the
+             goal node can not be reached.
     """
     steps_to_solution = []
+    # Without a goal node the problem graph has no heuristic weights and there is nothing to search for
+    if not any(_g.nodes[node]['is_goal'] for node in _g.nodes):
+        return [], steps_to_solution
 
     visited = []
     frontier = [_node]
@@ -77,6 +81,8 @@ def a_star(_g, _node):
             
         steps_to_solution.append({'current_node': current_node, 'frontier': list(frontier), 'visited': list(visited)})
 
+    return [], steps_to_solution
+
 
 def set_a_star_colors(_g, current_node, frontier, visited):
     color_map = []
@@ -95,14 +101,20 @@ def set_a_star_colors(_g, current_node, frontier, visited):
     return color_map
 
 
-def solve_a_star(g, root_node):
+def solve_a_star(g, root_node, raster=None):
     """
     Solve the problem by running an A* search on the provided graph starting from the provided node.
     Plots the problem graph, the result graph (path from root to goal) and the state of the A* after each iteration.
 
     :param g: The problem graph.
     :param root_node: The starting node of the graph.
+    :param raster: A flag indicating whether to draw the graphs as density rasters. In that case the result is drawn
+                   as a path over the problem graph and the state of the A* after each iteration is not plotted.
+                   Default value = None, which draws graphs larger than graph.RASTER_THRESHOLD as rasters.
     """
+    if raster is None:
+        raster = len(g) > graph.RASTER_THRESHOLD
+
     # #################### Preparation #################### #
 
     # Prepare problem graph's plot data 
@@ -124,7 +136,7 @@ def solve_a_star(g, root_node):
     plt.title("All Possible Problem Steps")
 
     # Draw the problem graph on the plot
-    graph.draw_network(g, pos, color_map, labels, draw_weights=True)
+    graph.draw_network(g, pos, color_map, labels, draw_weights=True, raster=raster)
 
     # #################### Solution #################### #
     # Run A* on the problem graph and keep the search steps in a separate variable for plotting.
@@ -139,24 +151,32 @@ def solve_a_star(g, root_node):
     # This allows us to plot the whole graph verbosely, knowing exactly the state of the A* after each iteration.
     a_star_result, a_star_steps = a_star(g, root_node)
 
-    # Make a copy of the problem network and discard the nodes that were not used in the solution
-    g_result = graph.filter_graph_copy(g, a_star_result)
-
-    # Prepare plot data for the resulting graph
-    pos_result, color_map_result, labels_result = graph.prepare_plot_data(g_result)
-
-    # Since the position of the nodes is calculated based on the number of the nodes per level,
-    # remap their position to match the original, which was calculated when preparing the problem's plot data
-    pos_result = graph.align_positions(pos, pos_result)
-
     # Create the second subplot for the result's network graph
     axes += [plt.subplot(1, 2, 2)]
 
     # Result graph plot title
-    plt.title("A* Result: {} Moves - {} Steps".format(len(a_star_result) - 1, len(a_star_steps)))
+    if a_star_result:
+        plt.title("A* Result: {} Moves - {} Steps".format(len(a_star_result) - 1, len(a_star_steps)))
+    else:
+        plt.title("A* Result: No Solution - {} Steps".format(len(a_star_steps)))
 
-    # Draw the result graph on the plot
-    graph.draw_network(g_result, pos_result, color_map_result, labels_result)
+    if raster:
+        # Draw the result path over the raster of the problem graph, where the nodes visited by the A* are colored
+        graph.draw_network_raster(g, pos, path=a_star_result,
+                                  visited=a_star_steps[-1]['visited'] if a_star_steps else ())
+    else:
+        # Make a copy of the problem network and discard the nodes that were not used in the solution
+        g_result = graph.filter_graph_copy(g, a_star_result)
+
+        # Prepare plot data for the resulting graph
+        pos_result, color_map_result, labels_result = graph.prepare_plot_data(g_result)
+
+        # Since the position of the nodes is calculated based on the number of the nodes per level,
+        # remap their position to match the original, which was calculated when preparing the problem's plot data
+        pos_result = graph.align_positions(pos, pos_result)
+
+        # Draw the result graph on the plot
+        graph.draw_network(g_result, pos_result, color_map_result, labels_result)
 
     graph.clear_axes(axes)
     legend_elements = [Line2D([0], [0], marker='o', color='deepskyblue',
@@ -171,11 +191,20 @@ def solve_a_star(g, root_node):
                               markersize=10),
                        Rectangle((0, 0), 1, 1, fc="w", fill=False, edgecolor='none', linewidth=0,
                                  label="The line numbers show the 'straight-line distance' to the goal")]
+    # The raster does not draw the edge weights, but it colors the nodes visited by the A*
+    if raster:
+        legend_elements.pop()
+        legend_elements.append(Line2D([0], [0], marker='o', color='greenyellow',
+                                      label='Visited Node', markerfacecolor='greenyellow', markersize=10))
 
     graph.add_legend(legend_elements, axes[1], (0.15, 0))
 
     plt.savefig("dist/A_Star_Problem_Solution_Figure.png", bbox_inches='tight')
 
+    # Large graphs take too many steps to plot each one of them
+    if raster or not a_star_steps:
+        return
+
     # #################### Solution Analysis #################### #
     # Create a new figure for solution step plotting
     fig2 = plt.figure('Cannibals And Missionaries Solution Steps With A*', figsize=(20, 10))
@@ -191,7 +220,7 @@ def solve_a_star(g, root_node):
     max_cols = 8
     num_of_steps = len(a_star_steps)
     num_rows = ceil(num_of_steps/max_cols)
-    num_cols_last_row = num_of_steps % max_cols
+    num_cols_last_row = num_of_steps - (num_rows - 1) * max_cols
     
     for r in range(1, num_rows + 1):
         num_cols = max_cols if r < num_rows else num_cols_last_row
@@ -241,7 +270,8 @@ def solve_a_star(g, root_node):
 
 if __name__ == "__main__":
     import os
+    import sys
 
     if not os.path.exists('dist'):
         os.makedirs('dist')
-    solve_a_star(*graph.problem_graph())
+    solve_a_star(*graph.problem_graph(*[int(arg) for arg in sys.argv[1:4]]))
@@ -45,14 +45,20 @@ def dfs(_g, _node, stack=None, steps_to_solution=None):
         return [], steps_to_solution
 
 
-def solve_dfs(g, root_node):
+def solve_dfs(g, root_node, raster=None):
     """
     Solve the problem by running a dfs on the provided graph starting from the provided node. Plots the problem graph,
     the result graph (path from root to goal) and the state of the dfs after each iteration.
 
     :param g: The problem graph.
     :param root_node: The starting node of the graph.
+    :param raster: A flag indicating whether to draw the graphs as density rasters. In that case the result is drawn
+                   as a path over the problem graph and the state of the dfs after each iteration is not plotted.
+                   Default value = None, which draws graphs larger than graph.RASTER_THRESHOLD as rasters.
     """
+    if raster is None:
+        raster = len(g) > graph.RASTER_THRESHOLD
+
     # #################### Preparation #################### #
 
     # Prepare problem graph's plot data 
@@ -74,7 +80,7 @@ def solve_dfs(g, root_node):
     plt.title("All Possible Problem Steps")
 
     # Draw the problem graph on the plot
-    graph.draw_network(g, pos, color_map, labels)
+    graph.draw_network(g, pos, color_map, labels, raster=raster)
 
     # #################### Solution #################### #
     # Run DFS on the problem graph and keep the search steps in a separate variable for plotting.
@@ -91,24 +97,31 @@ def solve_dfs(g, root_node):
     # and not the  number of stack removals
     dfs_steps = [s for s in dfs_states if s[1] == 'stack']
 
-    # Make a copy of the problem network and discard the nodes that were not used in the solution
-    g_result = graph.filter_graph_copy(g, dfs_result)
-
-    # Prepare plot data for the resulting graph
-    pos_result, color_map_result, labels_result = graph.prepare_plot_data(g_result)
-
-    # Since the position of the nodes is calculated based on the number of the nodes per level,
-    # remap their position to match the original, which was calculated when preparing the problem's plot data
-    pos_result = graph.align_positions(pos, pos_result)
-
     # Create the second subplot for the result's network graph
     axes += [plt.subplot(1, 2, 2)]
 
     # Result graph plot title
-    plt.title("DFS Result: {} Moves - {} Steps".format(len(dfs_result) - 1, len(dfs_steps)))
+    if dfs_result:
+        plt.title("DFS Result: {} Moves - {} Steps".format(len(dfs_result) - 1, len(dfs_steps)))
+    else:
+        plt.title("DFS Result: No Solution - {} Steps".format(len(dfs_steps)))
 
-    # Draw the result graph on the plot
-    graph.draw_network(g_result, pos_result, color_map_result, labels_result)
+    if raster:
+        # Draw the result path over the raster of the problem graph, where the nodes visited by the dfs are colored
+        graph.draw_network_raster(g, pos, path=dfs_result)
+    else:
+        # Make a copy of the problem network and discard the nodes that were not used in the solution
+        g_result = graph.filter_graph_copy(g, dfs_result)
+
+        # Prepare plot data for the resulting graph
+        pos_result, color_map_result, labels_result = graph.prepare_plot_data(g_result)
+
+        # Since the position of the nodes is calculated based on the number of the nodes per level,
+        # remap their position to match the original, which was calculated when preparing the problem's plot data
+        pos_result = graph.align_positions(pos, pos_result)
+
+        # Draw the result graph on the plot
+        graph.draw_network(g_result, pos_result, color_map_result, labels_result)
 
     # Format the plots' appearance and add a custom legend to them
     graph.clear_axes(axes)
@@ -122,10 +135,18 @@ def solve_dfs(g, root_node):
                        Line2D([0], [0], marker='o', color='limegreen',
                               label='Solution - Everyone has crossed the river', markerfacecolor='limegreen',
                               markersize=10)]
+    # The raster colors the nodes visited by the dfs
+    if raster:
+        legend_elements.append(Line2D([0], [0], marker='o', color='greenyellow',
+                                      label='Visited Node', markerfacecolor='greenyellow', markersize=10))
     graph.add_legend(legend_elements, axes[1], (0.15, 0))
 
     plt.savefig("dist/DFS_Problem_Solution_Figure.png", bbox_inches='tight')
 
+    # Large graphs take too many steps to plot each one of them
+    if raster:
+        return
+
     # #################### Solution Analysis #################### #
     # Create a new figure for solution step plotting
     fig2 = plt.figure('Cannibals And Missionaries Solution Steps With DFS', figsize=(20, 10))
@@ -141,7 +162,7 @@ def solve_dfs(g, root_node):
     max_cols = 10
     num_of_states = len(dfs_states)
     num_rows = ceil(num_of_states/max_cols)
-    num_cols_last_row = num_of_states % max_cols
+    num_cols_last_row = num_of_states - (num_rows - 1) * max_cols
 
     # Add a variable for counting pops, this will help track the correct step number
     pop_count = 0
@@ -187,6 +208,7 @@ def solve_dfs(g, root_node):
 
 if __name__ == "__main__":
     import os
+    import sys
     if not os.path.exists('dist'):
         os.makedirs('dist')
-    solve_dfs(*graph.problem_graph())
+    solve_dfs(*graph.problem_graph(*[int(arg) for arg in sys.argv[1:4]]))
@@ -0,0 +1,213 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from state_space import apply_operators, is_bad, root_state_id, state_node
+
+
+# #################### Function declarations #################### #
+
+class SortedRun:
+    """
+    Reads a file of int64 records sorted by their first column one block at a time, so that only a single block of
+    each file is kept in memory, no matter how large the file is.
+    """
+
+    def __init__(self, path, columns, block_size):
+        """
+        :param path: The path of the run file.
+        :param columns: The number of int64 values of each record.
+        :param block_size: The max number of records to keep in memory.
+        """
+        self.path = path
+        self.columns = columns
+        self.block_size = block_size
+        self.position = 0
+        self.size = os.path.getsize(path) // (8 * columns)
+        self.buffer = np.empty((0, columns), dtype=np.int64)
+
+    def fill(self):
+        """
+        Reads the next block of the file if the buffer is empty.
+
+        :return: False if there are no records left in the buffer or the file, True otherwise.
+        """
+        if len(self.buffer) == 0 and self.position < self.size:
+            count = min(self.block_size, self.size - self.position)
+            with open(self.path, 'rb') as f:
+                f.seek(self.position * 8 * self.columns)
+                self.buffer = np.fromfile(f, dtype=np.int64, count=count * self.columns).reshape(-1, self.columns)
+            self.position += count
+        return len(self.buffer) > 0
+
+    def take_until(self, key):
+        """
+        Removes and returns the buffered records whose first column is less than or equal to the passed key.
+
+        :param key: The largest key to return.
+        :return: The records as an array with one row per record.
+        """
+        idx = np.searchsorted(self.buffer[:, 0], key, side='right')
+        records, self.buffer = self.buffer[:idx], self.buffer[idx:]
+        return records
+
+    def contains(self, keys):
+        """
+        Checks which of the passed keys are in the file. The keys must be sorted and greater than or equal to the keys
+        of any previous call, since the blocks before them are discarded.
+
+        :param keys: The sorted keys to look for.
+        :return: A boolean array that is True for each key found in the file.
+        """
+        found = np.zeros(len(keys), dtype=bool)
+        start = 0
+        while start < len(keys) and self.fill():
+            found[start:] |= np.isin(keys[start:], self.buffer[:, 0])
+            start = np.searchsorted(keys, self.buffer[-1, 0], side='right')
+            if start < len(keys):
+                self.buffer = self.buffer[:0]
+        return found
+
+
+def merge_runs(run_paths, output_paths, block_size, closed_paths=()):
+    """
+    Merges sorted runs of (state, parent) records into a single sorted output, keeping only the first record of each
+    state. This is the delayed duplicate detection: the duplicates within a layer and the states of the closed layers
+    are only removed here, after the whole layer has been written to the disk.
+
+    :param run_paths: The paths of the run files to merge.
+    :param output_paths: Either the path of a single (state, parent) run file, or a tuple with the paths of a layer
+                         file with the states and a parents file with the parent of each state.
+    :param block_size: The max number of records to keep in memory from each file.
+    :param closed_paths: The paths of the layer files whose states to remove from the output.
+    """
+    runs = [SortedRun(path, 2, block_size) for path in run_paths]
+    closed = [SortedRun(path, 1, block_size) for path in closed_paths]
+    outputs = [open(path, 'wb') for path in ([output_paths] if isinstance(output_paths, str) else output_paths)]
+    last_state = None
+
+    while True:
+        runs = [run for run in runs if run.fill()]
+        if not runs:
+            break
+
+        # Every record up to the smallest last key of the buffers is already in memory
+        cutoff = min(run.buffer[-1, 0] for run in runs)
+        records = np.concatenate([run.take_until(cutoff) for run in runs])
+        records = records[np.argsort(records[:, 0], kind='stable')]
+
+        keep = np.ones(len(records), dtype=bool)
+        keep[1:] = records[1:, 0] != records[:-1, 0]
+        if last_state is not None:
+            keep &= records[:, 0] != last_state
+        last_state = records[-1, 0]
+        records = records[keep]
+        for run in closed:
+            records = records[~run.contains(records[:, 0])]
+
+        if len(outputs) == 1:
+            records.tofile(outputs[0])
+        else:
+            records[:, 0].tofile(outputs[0])
+            records[:, 1].tofile(outputs[1])
+
+    for output in outputs:
+        output.close()
+
+
+def external_bfs(missionaries=3, cannibals=3, boat_capacity=2, directory=None, block_size=1 << 20, fan_in=16):
+    """
+    Runs a breadth-first search on the compact state IDs of the problem, keeping the frontier layers and the closed
+    set on the disk instead of the memory. Each layer is expanded one block at a time into sorted run files, which
+    are then merged into the next layer, removing the states of the last two layers. Since every crossing can be
+    undone, no state of an earlier layer can be found again. The bad nodes are obstacles, the same way the A* treats
+    them. The parent of each state is kept in a separate file for each layer, which is used to rebuild the path
+    without keeping any of it in memory.
+
+    :param missionaries: The number of missionaries of the problem. Default value = 3.
+    :param cannibals: The number of cannibals of the problem. Default value = 3.
+    :param boat_capacity: The max number of people the boat can carry on each crossing. Default value = 2.
+    :param directory: The directory to keep the files in. If it is not passed, a temporary directory is used and
+                      deleted along with the files when the search ends.
+    :param block_size: The max number of records to keep in memory from each file. Each state of a layer produces a
+                       record for every operator when expanded, so only block_size divided by the number of
+                       operators states are expanded at a time. Default value = 1048576.
+    :param fan_in: The max number of run files to merge at once. Default value = 16.
+    :return: The result path from the goal to the root, in the same order as the A* of a_star.py, or an empty list if
+             the goal can not be reached.
+    """
+    work_directory = directory if directory is not None else tempfile.mkdtemp(prefix='external_bfs_')
+    os.makedirs(work_directory, exist_ok=True)
+
+    def layer_path(_level):
+        return os.path.join(work_directory, 'layer_{}.bin'.format(_level))
+
+    def parents_path(_level):
+        return os.path.join(work_directory, 'parents_{}.bin'.format(_level))
+
+    try:
+        np.array([root_state_id(missionaries, cannibals)], dtype=np.int64).tofile(layer_path(0))
+        np.array([-1], dtype=np.int64).tofile(parents_path(0))
+
+        num_of_operators = (boat_capacity + 1) * (boat_capacity + 2) // 2 - 1
+        level = 0
+        while True:
+            layer = SortedRun(layer_path(level), 1, max(block_size // num_of_operators, 1))
+            if layer.size == 0:
+                return []
+            # The goal state has the smallest ID, so it is always first in its layer
+            if layer.fill() and layer.buffer[0, 0] == 0:
+                break
+
+            run_paths = []
+            while layer.fill():
+                frontier = layer.take_until(layer.buffer[-1, 0])[:, 0]
+                new_ids, sources = apply_operators(frontier, missionaries, cannibals, boat_capacity)
+                records = np.stack([new_ids, frontier[sources]], axis=1)
+                records = records[~is_bad(new_ids, missionaries, cannibals)]
+                records = records[np.argsort(records[:, 0], kind='stable')]
+
+                run_paths.append(os.path.join(work_directory, 'run_{}_{}.bin'.format(level + 1, len(run_paths))))
+                records.tofile(run_paths[-1])
+
+            # Merge the runs in several passes if there are too many of them to keep a block of each in memory
+            while len(run_paths) > fan_in:
+                merged_paths = []
+                for i in range(0, len(run_paths), fan_in):
+                    merged_paths.append(run_paths[i] + '.merged')
+                    merge_runs(run_paths[i:i + fan_in], merged_paths[-1], block_size)
+                for path in run_paths:
+                    os.remove(path)
+                run_paths = merged_paths
+
+            merge_runs(run_paths, (layer_path(level + 1), parents_path(level + 1)), block_size,
+                       [layer_path(_level) for _level in range(max(level - 1, 0), level + 1)])
+            for path in run_paths:
+                os.remove(path)
+            level += 1
+
+        # Follow the parents from the goal back to the root, reading only the parts of the files that are needed
+        current_state = 0
+        path = [state_node(current_state, missionaries, cannibals)]
+        for _level in range(level, 0, -1):
+            states = np.memmap(layer_path(_level), dtype=np.int64, mode='r')
+            parents = np.memmap(parents_path(_level), dtype=np.int64, mode='r')
+            current_state = int(parents[np.searchsorted(states, current_state)])
+            path.append(state_node(current_state, missionaries, cannibals))
+            del states, parents
+        return path
+    finally:
+        if directory is None:
+            shutil.rmtree(work_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    problem = [int(arg) for arg in sys.argv[1:4]] or [3, 3, 2]
+    start_time = time.time()
+    result = external_bfs(*problem)
+    print("{} Moves - {:.2f}s".format(len(result) - 1, time.time() - start_time))
@@ -1,26 +1,37 @@
 from copy import deepcopy
 
+import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+from matplotlib import colors
 
 
-def problem_graph():
+# Graphs with more nodes than this are drawn as a density raster by the solvers, since drawing them node by node is
+# slow and the result can not be read
+RASTER_THRESHOLD = 100
+
+
+def problem_graph(missionaries=3, cannibals=3, boat_capacity=2):
     """
     Builds the problem graph for the Missionaries and Cannibals problem using
     NetworkX. It calculates the node level (recursion level), which is helpful
     when drawing the graph in a tree-like format, along with the straight distance
     of each node to the goal node, which is saved on the next edges of each node
     since each one of them may have multiple paths leading to the goal.
+    The graph is built recursively, so only small problems fit in Python's default recursion limit, which is exceeded
+    at around 30 missionaries, 30 cannibals and a boat for 5. Larger problems can be explored on their compact state
+    IDs instead, with parallel_bfs, external_bfs and optimal_paths.count_optimal_solutions.
 
+    :param missionaries: The number of missionaries waiting on the starting river bank. Default value = 3.
+    :param cannibals: The number of cannibals waiting on the starting river bank. Default value = 3.
+    :param boat_capacity: The max number of people the boat can carry on each crossing. Default value = 2.
     :return: Tuple containing the problem graph and the root node of the graph
     """
-    starting_bank = sorted(['m', 'm', 'm', 'c', 'c', 'c', 'b'])
+    starting_bank = sorted(['m'] * missionaries + ['c'] * cannibals + ['b'])
     ending_bank = []
 
-    operators = sorted([sorted(l) for l in [['m'],
-                                            ['c'],
-                                            ['m', 'm'],
-                                            ['c', 'c'],
-                                            ['m', 'c']]])
+    operators = sorted([sorted(['m'] * m + ['c'] * c) for m in range(boat_capacity + 1)
+                        for c in range(boat_capacity + 1 - m) if m + c > 0])
 
     def build_node(_starting_bank, _ending_bank):
         """
@@ -109,7 +120,9 @@ def problem_graph():
         It starts with the root node and applies all possible operators on each. It then repeats the same process
         recursively for the resulting nodes using them as root nodes. If a new node can not be created because of an
         inapplicable operator or if it already is part of the graph, then it is skipped. An edge is created between
-        the parent node and the resulting nodes. This process also sets the flags of each node in its data dict.
+        the parent node and the resulting nodes, which keeps the applied operator as its 'operator'. Since the same
+        people cross back when moving the opposite way, the operator applies to both directions. This process also
+        sets the flags of each node in its data dict.
 
         :param _g: A graph object that will be populated with nodes and edges.
         :param _node: The root node to place in the beginning of the graph.
@@ -117,7 +130,7 @@ def problem_graph():
         for op in operators:
             new_node = cross_river(_node[0], _node[1], op)
             if (new_node is not None) and (not _g.has_edge(_node, new_node)):
-                _g.add_edge(_node, new_node)
+                _g.add_edge(_node, new_node, operator=tuple(op))
 
                 _is_bad, is_goal, is_root = get_flags(_node)
                 _g.nodes[_node]['is_bad'] = False if is_goal else _is_bad
@@ -192,7 +205,9 @@ def problem_graph():
     build_graph(g, root_node)
     set_levels(g, root_node)
     goal_node = get_goal_node(g)
-    set_heuristic_weights(g, goal_node)
+    # Some combinations of missionaries, cannibals and boat capacity have no solution, hence no goal node
+    if goal_node is not None:
+        set_heuristic_weights(g, goal_node)
     return g, root_node
 
 
@@ -284,7 +299,7 @@ def align_positions(pos_origin, pos_target):
     return aligned_pos
 
 
-def draw_network(_g, pos, color_map, labels, node_size=1250, font_size=8, draw_weights=False):
+def draw_network(_g, pos, color_map, labels, node_size=1250, font_size=8, draw_weights=False, raster=False):
     """
     Draws the network's nodes, edges and labels in the active plot.
 
@@ -295,7 +310,12 @@ def draw_network(_g, pos, color_map, labels, node_size=1250, font_size=8, draw_w
     :param node_size: The size of the node. Default value = 1250 for the default plot dpi.
     :param font_size: The size of the label font. Default value = 8 for the default plot dpi.
     :param draw_weights: A flag indicating whether to draw the edge weight number over each line in the plot.
+    :param raster: A flag indicating whether to draw the network as a density raster with draw_network_raster.
+                   The colors, labels, sizes and weights are ignored in that case and no node is drawn as visited.
     """
+    if raster:
+        draw_network_raster(_g, pos, visited=())
+        return
     nx.draw_networkx_nodes(_g, pos, node_color=color_map, node_size=node_size)
     nx.draw_networkx_edges(_g, pos, alpha=0.2)
     nx.draw_networkx_labels(_g, pos, labels, font_size=font_size)
@@ -303,6 +323,76 @@ def draw_network(_g, pos, color_map, labels, node_size=1250, font_size=8, draw_w
         nx.draw_networkx_edge_labels(_g, pos, edge_labels=nx.get_edge_attributes(_g, 'weight'))
 
 
+def draw_network_raster(_g, pos, path=None, visited=None, resolution=(400, 300), edge_samples=16):
+    """
+    Draws the network in the active plot as a density raster instead of drawing each node and edge. The nodes and
+    edges are binned into a grid of pixels, so drawing takes the same time no matter how many nodes fall in a pixel.
+    The edges are drawn in grey, darker where more of them pass. Each pixel with nodes takes the colors of
+    prepare_plot_data mixed by the share of the root, goal, bad, visited and valid nodes in it, and it is more opaque
+    the more nodes it has. The solution path is drawn over the raster as lines.
+
+    :param _g: The graph to draw.
+    :param pos: The list with node positions for the nodes of the graph, as calculated by prepare_plot_data.
+    :param path: The list of the nodes of the solution path to draw over the raster. Default value = None.
+    :param visited: The list of the visited nodes. If it is not passed, the nodes with 'visited' in their data, which
+                    are the nodes visited by the dfs, are used instead. Default value = None.
+    :param resolution: The number of pixels of the raster on the x and y axis. Default value = (400, 300).
+    :param edge_samples: The number of points each edge is sampled on when binning it. Default value = 16.
+    """
+    if visited is None:
+        visited = set(node for node, node_data in _g.nodes(data=True) if 'visited' in node_data)
+    visited = set(visited)
+    categories = ['deepskyblue', 'limegreen', 'orangered', 'greenyellow', 'gold']
+    xy = np.empty((len(_g), 2))
+    node_categories = np.empty(len(_g), dtype=int)
+    for i, (node, node_data) in enumerate(_g.nodes(data=True)):
+        xy[i] = pos[node]
+        if node_data['is_root']:
+            node_categories[i] = 0
+        elif node_data['is_goal']:
+            node_categories[i] = 1
+        elif node_data['is_bad']:
+            node_categories[i] = 2
+        elif node in visited:
+            node_categories[i] = 3
+        else:
+            node_categories[i] = 4
+
+    # Leave a margin of half a pixel around the nodes, so that the ones on the edges of the plot are not cut in half
+    x_range = (xy[:, 0].min(), xy[:, 0].max())
+    y_range = (xy[:, 1].min(), xy[:, 1].max())
+    margin = [max(_range[1] - _range[0], 1) / (2 * size) for _range, size in zip((x_range, y_range), resolution)]
+    bins_range = [(x_range[0] - margin[0], x_range[1] + margin[0]), (y_range[0] - margin[1], y_range[1] + margin[1])]
+    extent = [*bins_range[0], *bins_range[1]]
+
+    # Sample each edge on evenly spaced points between its nodes and bin the points instead of the lines
+    edges = np.array([(pos[u], pos[v]) for u, v in _g.edges]).reshape(-1, 2, 2)
+    t = np.linspace(0, 1, edge_samples)[None, :, None]
+    samples = (edges[:, None, 0] * (1 - t) + edges[:, None, 1] * t).reshape(-1, 2)
+    edge_density, _, _ = np.histogram2d(samples[:, 0], samples[:, 1], bins=resolution, range=bins_range)
+    edge_image = np.zeros(edge_density.T.shape + (4,))
+    if edge_density.max() > 0:
+        edge_image[..., :3] = colors.to_rgb('grey')
+        edge_image[..., 3] = 0.4 * np.log1p(edge_density.T) / np.log1p(edge_density.max())
+    plt.imshow(edge_image, extent=extent, origin='lower', aspect='auto', interpolation='nearest')
+
+    node_density, _, _ = np.histogram2d(xy[:, 0], xy[:, 1], bins=resolution, range=bins_range)
+    node_image = np.zeros(node_density.T.shape + (4,))
+    for category, color in enumerate(categories):
+        in_category = node_categories == category
+        category_density, _, _ = np.histogram2d(xy[in_category, 0], xy[in_category, 1], bins=resolution,
+                                                range=bins_range)
+        share = np.divide(category_density.T, node_density.T, out=np.zeros_like(node_image[..., 0]),
+                          where=node_density.T > 0)
+        node_image[..., :3] += share[..., None] * colors.to_rgb(color)
+    node_image[..., 3] = np.log1p(node_density.T) / np.log1p(node_density.max())
+    plt.imshow(node_image, extent=extent, origin='lower', aspect='auto', interpolation='nearest')
+
+    if path:
+        path_xy = np.array([pos[node] for node in path])
+        plt.plot(path_xy[:, 0], path_xy[:, 1], color='dodgerblue', linewidth=1.5, marker='o', markersize=3)
+
+
 def clear_axes(axes):
     """
     Removes the x and y ticks from all the passed axes.
@@ -0,0 +1,170 @@
+from heapq import heappush, heappop
+
+import graph
+from a_star import heuristic
+
+
+INFINITY = float('inf')
+
+
+class LPAStar:
+    """
+    Incremental A* (Lifelong Planning A*) on the problem graph. The first search expands the same nodes a plain A*
+    would, but the distances from the start are kept between searches. When nodes are forbidden or the cost of a
+    crossing changes, only the nodes whose distance is affected by the change are expanded again during re-planning,
+    instead of searching the whole graph from scratch.
+
+    The bad nodes are obstacles, exactly like in the A* of a_star.py, except for the start node, which is where the
+    search begins even if it is bad. Every crossing costs 1 unless changed with
+    set_edge_cost. The heuristic is the unscaled straight distance to the goal of a_star.py, which stays consistent
+    as long as no crossing costs less than 1.
+    """
+
+    def __init__(self, _g, _node):
+        """
+        Prepares the search without running it. Call compute_shortest_path to get the first path.
+
+        :param _g: The problem graph.
+        :param _node: The node from which the search begins.
+        """
+        self._g = _g
+        self.start_node = _node
+        self.goal_node = next((node for node in _g.nodes if _g.nodes[node]['is_goal']), None)
+        self.forbidden = set()
+        self.costs = {}
+
+        self.distance_from_start = {}
+        self.lookahead = {_node: 0}
+        self.estimates = {}
+        self.queue = []
+        self.queued = {}
+        self._push(_node)
+
+    def _estimate(self, _node):
+        # Without a goal node the problem graph has no heuristic weights, and nothing is ever searched
+        if self.goal_node is None:
+            return 0
+        if _node not in self.estimates:
+            self.estimates[_node] = heuristic(self._g, _node)
+        return self.estimates[_node]
+
+    def _key(self, _node):
+        best = min(self.distance_from_start.get(_node, INFINITY), self.lookahead.get(_node, INFINITY))
+        return best + self._estimate(_node), best
+
+    def _push(self, _node):
+        key = self._key(_node)
+        self.queued[_node] = key
+        heappush(self.queue, (key, _node))
+
+    def _top_key(self):
+        # Entries are never removed from the heap when a node is re-queued or leaves the queue.
+        # Instead, the outdated ones are dropped when they reach the top.
+        while self.queue and self.queued.get(self.queue[0][1]) != self.queue[0][0]:
+            heappop(self.queue)
+        return self.queue[0][0] if self.queue else (INFINITY, INFINITY)
+
+    def cost(self, node_from, node_to):
+        """
+        Returns the cost of crossing the river from one node to the other.
+
+        :param node_from: The node the boat leaves from.
+        :param node_to: The node the boat arrives to.
+        :return: The cost of the crossing, which is infinite if either node is forbidden or if it is bad and it is not
+                 the start node.
+        """
+        for _node in (node_from, node_to):
+            if _node in self.forbidden or (self._g.nodes[_node]['is_bad'] and _node != self.start_node):
+                return INFINITY
+        return self.costs.get(frozenset((node_from, node_to)), 1)
+
+    def _update_node(self, _node):
+        if _node != self.start_node:
+            self.lookahead[_node] = min([self.distance_from_start.get(neighbor, INFINITY) + self.cost(neighbor, _node)
+                                         for neighbor in self._g.neighbors(_node)], default=INFINITY)
+        self.queued.pop(_node, None)
+        if self.distance_from_start.get(_node, INFINITY) != self.lookahead.get(_node, INFINITY):
+            self._push(_node)
+
+    def set_edge_cost(self, node_from, node_to, cost):
+        """
+        Changes the cost of crossing the river between two nodes. Costs lower than 1 make the heuristic inadmissible.
+
+        :param node_from: The first node of the crossing.
+        :param node_to: The second node of the crossing.
+        :param cost: The new cost of the crossing, in both directions.
+        """
+        self.costs[frozenset((node_from, node_to))] = cost
+        self._update_node(node_from)
+        self._update_node(node_to)
+
+    def forbid_node(self, _node):
+        """
+        Forbids a node, so that no path can pass through it, the same way the bad nodes are avoided.
+
+        :param _node: The node to forbid.
+        """
+        self.forbidden.add(_node)
+        self._update_node(_node)
+        for neighbor in self._g.neighbors(_node):
+            self._update_node(neighbor)
+
+    def allow_node(self, _node):
+        """
+        Allows a node that was forbidden with forbid_node to be part of a path again.
+
+        :param _node: The node to allow.
+        """
+        self.forbidden.discard(_node)
+        self._update_node(_node)
+        for neighbor in self._g.neighbors(_node):
+            self._update_node(neighbor)
+
+    def compute_shortest_path(self):
+        """
+        Expands the nodes whose distance from the start changed since the last call, until the distance of the goal is
+        final, and returns the optimal path. It is called after every batch of changes to re-plan.
+
+        :return: The optimal path as a list of nodes from the start to the goal or an empty list if there is none.
+        """
+        if self.goal_node is None:
+            return []
+
+        while (self._top_key() < self._key(self.goal_node) or
+               self.lookahead.get(self.goal_node, INFINITY) != self.distance_from_start.get(self.goal_node, INFINITY)):
+            _, current_node = heappop(self.queue)
+            del self.queued[current_node]
+
+            if self.distance_from_start.get(current_node, INFINITY) > self.lookahead[current_node]:
+                self.distance_from_start[current_node] = self.lookahead[current_node]
+            else:
+                self.distance_from_start[current_node] = INFINITY
+                self._update_node(current_node)
+            for neighbor in self._g.neighbors(current_node):
+                self._update_node(neighbor)
+
+        if self.distance_from_start.get(self.goal_node, INFINITY) == INFINITY:
+            return []
+
+        current_node = self.goal_node
+        path = [current_node]
+        while current_node != self.start_node:
+            current_node = min(self._g.neighbors(current_node),
+                               key=lambda node: self.distance_from_start.get(node, INFINITY) +
+                               self.cost(node, current_node))
+            path.append(current_node)
+        return path[::-1]
+
+
+if __name__ == "__main__":
+    g, root_node = graph.problem_graph()
+    _, _, labels = graph.prepare_plot_data(g)
+    planner = LPAStar(g, root_node)
+
+    path = planner.compute_shortest_path()
+    print("{} Moves: {}".format(len(path) - 1, " -> ".join(labels[node] for node in path)))
+
+    # Forbid the first state after the start and re-plan around it
+    planner.forbid_node(path[1])
+    path = planner.compute_shortest_path()
+    print("{} Moves: {}".format(len(path) - 1, " -> ".join(labels[node] for node in path)))
@@ -4,10 +4,11 @@ from graph import problem_graph
 
 if __name__ == "__main__":
     import os
+    import sys
 
     if not os.path.exists('dist'):
         os.makedirs('dist')
 
-    prob_graph = problem_graph()
+    prob_graph = problem_graph(*[int(arg) for arg in sys.argv[1:4]])
     solve_dfs(*prob_graph)
     solve_a_star(*prob_graph)
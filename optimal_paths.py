@@ -0,0 +1,186 @@
+import random
+
+import networkx as nx
+import numpy as np
+
+import graph
+from state_space import apply_operators, is_bad, root_state_id
+
+
+# #################### Function declarations #################### #
+
+def shortest_path_dag(_g, _node):
+    """
+    Builds the shortest-path DAG of the passed graph starting with the passed node. The graph is layered breadth first
+    from the passed node, ignoring the bad nodes the same way the A* does, since they are obstacles and can never be
+    part of a solution. The 'level' of the problem graph can not be used as is, because set_levels walks through the
+    bad nodes as well and therefore some of its levels are shorter than any valid path. An edge (u, v) is kept only
+    if v lies exactly one layer below u and v can still reach the goal node in the remaining layers, which means that
+    every root to goal path of the DAG is an optimal solution and every optimal solution is a path of the DAG.
+    Each node of the DAG gets its 'distance' from the passed node and the number of optimal paths leading from it to
+    the goal ('paths_to_goal'), calculated by dynamic programming over the layers.
+
+    :param _g: The problem graph.
+    :param _node: The node from which the optimal paths begin.
+    :return: The shortest-path DAG as a directed graph. The DAG is empty if the goal node can not be reached.
+    """
+    distance_from_start = {_node: 0}
+    layers = [[_node]]
+    goal_node = None
+
+    while layers[-1] and goal_node is None:
+        next_layer = []
+        for current_node in layers[-1]:
+            if _g.nodes[current_node]['is_goal']:
+                goal_node = current_node
+                break
+            for neighbor in _g.neighbors(current_node):
+                if _g.nodes[neighbor]['is_bad'] or neighbor in distance_from_start:
+                    continue
+                distance_from_start[neighbor] = len(layers)
+                next_layer.append(neighbor)
+        else:
+            layers.append(next_layer)
+
+    dag = nx.DiGraph()
+    if goal_node is None:
+        return dag
+
+    # Walk the layers backwards from the goal, so that only the nodes that actually lead to it are kept
+    # and the number of paths of each node is the sum of the number of paths of its successors.
+    dag.add_node(goal_node, distance=distance_from_start[goal_node], paths_to_goal=1)
+    for layer in reversed(layers[:distance_from_start[goal_node]]):
+        for current_node in layer:
+            successors = [nb for nb in _g.neighbors(current_node)
+                          if nb in dag and dag.nodes[nb]['distance'] == distance_from_start[current_node] + 1]
+            if not successors:
+                continue
+            dag.add_node(current_node, distance=distance_from_start[current_node],
+                         paths_to_goal=sum(dag.nodes[nb]['paths_to_goal'] for nb in successors))
+            for successor in successors:
+                dag.add_edge(current_node, successor)
+
+    return dag
+
+
+def count_optimal_paths(dag, _node):
+    """
+    Returns the number of optimal paths from the passed node to the goal without listing any of them.
+
+    :param dag: The shortest-path DAG returned by shortest_path_dag.
+    :param _node: The node from which the optimal paths begin.
+    :return: The number of optimal paths, which is 0 if the node is not part of the DAG.
+    """
+    if _node not in dag:
+        return 0
+    return dag.nodes[_node]['paths_to_goal']
+
+
+def count_optimal_solutions(missionaries=3, cannibals=3, boat_capacity=2):
+    """
+    Returns the number of optimal solutions of a problem without building the problem graph, which can not be built
+    for large problems since graph.problem_graph is recursive. The states are layered breadth first on their compact
+    state IDs (see state_space.state_id), with the bad states as obstacles like in shortest_path_dag, and the number
+    of shortest paths from the root to each state of a layer is the sum of the numbers of its parents in the previous
+    layer. The numbers are kept as Python integers, since they quickly outgrow any fixed size integer.
+
+    :param missionaries: The number of missionaries of the problem. Default value = 3.
+    :param cannibals: The number of cannibals of the problem. Default value = 3.
+    :param boat_capacity: The max number of people the boat can carry on each crossing. Default value = 2.
+    :return: The number of optimal solutions, which is 0 if the problem can not be solved.
+    """
+    num_of_states = 2 * (missionaries + 1) * (cannibals + 1)
+    paths_from_start = np.zeros(num_of_states, dtype=object)
+    visited = np.zeros(num_of_states, dtype=bool)
+
+    frontier = np.array([root_state_id(missionaries, cannibals)], dtype=np.int64)
+    paths_from_start[frontier] = 1
+    visited[frontier] = True
+    # The goal state always has the ID 0
+    while len(frontier) and not visited[0]:
+        new_ids, sources = apply_operators(frontier, missionaries, cannibals, boat_capacity)
+        keep = ~is_bad(new_ids, missionaries, cannibals) & ~visited[new_ids]
+        new_ids, sources = new_ids[keep], frontier[sources[keep]]
+        np.add.at(paths_from_start, new_ids, paths_from_start[sources])
+        frontier = np.unique(new_ids)
+        visited[frontier] = True
+
+    return int(paths_from_start[0])
+
+
+def optimal_paths(dag, _node):
+    """
+    Lazily yields every optimal path from the passed node to the goal, one at a time. Only the path that is currently
+    being yielded is kept in memory.
+
+    :param dag: The shortest-path DAG returned by shortest_path_dag.
+    :param _node: The node from which the optimal paths begin.
+    :return: A generator of paths. Each path is a list of nodes starting with the passed node and ending with the goal.
+    """
+    if _node not in dag:
+        return
+    if dag.out_degree(_node) == 0:
+        yield [_node]
+        return
+
+    path = [_node]
+    successors = [iter(dag.successors(_node))]
+    while successors:
+        successor = next(successors[-1], None)
+        if successor is None:
+            successors.pop()
+            path.pop()
+        elif dag.out_degree(successor) == 0:
+            yield path + [successor]
+        else:
+            path.append(successor)
+            successors.append(iter(dag.successors(successor)))
+
+
+def sample_optimal_path(dag, _node, rng=random):
+    """
+    Picks a single optimal path from the passed node to the goal uniformly at random. On each node, the next node is
+    chosen with probability proportional to its number of paths to the goal, so every optimal path is equally likely.
+
+    :param dag: The shortest-path DAG returned by shortest_path_dag.
+    :param _node: The node from which the optimal path begins.
+    :param rng: The random number generator to use. Default value = the random module.
+    :return: A list of nodes starting with the passed node and ending with the goal or an empty list if the node is not
+             part of the DAG.
+    """
+    if _node not in dag:
+        return []
+
+    path = [_node]
+    while dag.out_degree(path[-1]) > 0:
+        pick = rng.randrange(dag.nodes[path[-1]]['paths_to_goal'])
+        for successor in dag.successors(path[-1]):
+            pick -= dag.nodes[successor]['paths_to_goal']
+            if pick < 0:
+                path.append(successor)
+                break
+    return path
+
+
+def solve_optimal_paths(g, root_node):
+    """
+    Prints the number of optimal solutions of the problem graph along with each one of them.
+
+    :param g: The problem graph.
+    :param root_node: The starting node of the graph.
+    """
+    _, _, labels = graph.prepare_plot_data(g)
+    dag = shortest_path_dag(g, root_node)
+
+    print("Optimal Solutions: {}".format(count_optimal_paths(dag, root_node)))
+    for path in optimal_paths(dag, root_node):
+        print("{} Moves: {}".format(len(path) - 1, " -> ".join(labels[node] for node in path)))
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        print("Optimal Solutions: {}".format(count_optimal_solutions(*[int(arg) for arg in sys.argv[1:4]])))
+    else:
+        solve_optimal_paths(*graph.problem_graph())
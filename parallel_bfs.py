@@ -0,0 +1,267 @@
+from collections import deque
+from ctypes import c_int32
+from multiprocessing import Process, Queue, RawArray, cpu_count
+from queue import Empty
+from traceback import format_exc
+
+import numpy as np
+
+from state_space import apply_operators, is_bad, root_state_id
+
+
+# The shared state of each worker process, set once by init_worker when the process starts.
+_shared = {}
+
+
+# #################### Function declarations #################### #
+
+def init_worker(reached, visited, distances, missionaries, cannibals, boat_capacity):
+    """
+    Keeps the shared arrays and the problem parameters in the worker process.
+
+    :param reached: The shared bitmap of the states that are part of the problem graph.
+    :param visited: The shared bitmap of the states visited by the current search.
+    :param distances: The shared distance of each state from the source of the current search.
+    :param missionaries: The number of missionaries of the problem.
+    :param cannibals: The number of cannibals of the problem.
+    :param boat_capacity: The max number of people the boat can carry on each crossing.
+    """
+    _shared['reached'] = np.frombuffer(reached, dtype=np.uint8)
+    _shared['visited'] = np.frombuffer(visited, dtype=np.uint8)
+    _shared['distances'] = np.frombuffer(distances, dtype=np.int32)
+    _shared['problem'] = (missionaries, cannibals, boat_capacity)
+
+
+def is_set(bitmap, ids):
+    return ((bitmap[ids >> 3] >> (ids & 7).astype(np.uint8)) & 1).astype(bool)
+
+
+def set_bits(bitmap, ids):
+    np.bitwise_or.at(bitmap, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+
+
+def is_leaf(ids, missionaries, cannibals):
+    """
+    Returns whether graph.problem_graph stops building the graph on each state. The bad states are not expanded and
+    neither is the goal state, but the root state is always expanded, even if it is bad.
+
+    :param ids: The compact state IDs to check.
+    :param missionaries: The number of missionaries of the problem.
+    :param cannibals: The number of cannibals of the problem.
+    :return: A boolean array that is True for each state that is not expanded.
+    """
+    root_id = root_state_id(missionaries, cannibals)
+    return (is_bad(ids, missionaries, cannibals) | (ids == 0)) & (ids != root_id)
+
+
+def expand(frontier, mode):
+    """
+    Applies every operator on the states of the frontier and returns the new states that are not visited yet.
+    While searching for the states of the problem graph ('reach'), the leaf states are not expanded, the same way
+    graph.problem_graph builds the graph. While calculating distances ('distance'), the leaf states are expanded too,
+    but only to states that are part of the graph and are not leaves, since there are no edges between two leaf
+    nodes in the problem graph.
+
+    :param frontier: The compact state IDs of the frontier layer.
+    :param mode: Either 'reach' or 'distance'.
+    :return: The unique compact state IDs of the next layer, which may still contain states found by other processes.
+    """
+    missionaries, cannibals, boat_capacity = _shared['problem']
+    source_is_leaf = is_leaf(frontier, missionaries, cannibals)
+    if mode == 'reach':
+        frontier = frontier[~source_is_leaf]
+
+    new_ids, sources = apply_operators(frontier, missionaries, cannibals, boat_capacity)
+    if mode == 'distance':
+        new_ids = new_ids[~(source_is_leaf[sources] & is_leaf(new_ids, missionaries, cannibals))]
+        new_ids = new_ids[is_set(_shared['reached'], new_ids)]
+    return np.unique(new_ids[~is_set(_shared['visited'], new_ids)])
+
+
+def owner(ids, processes):
+    """
+    Returns the worker process that owns each state. The bytes of the visited bitmap are dealt to the processes in
+    turn, so each 8 consecutive IDs belong to a single process and the states of every layer are spread evenly across
+    all of them. Only the owner of a state sets its visited bit, which is why bits are never lost, even though two
+    processes setting different bits of the same byte at the same time would overwrite each other.
+
+    :param ids: The compact state IDs.
+    :param processes: The number of worker processes.
+    :return: The index of the process that owns each state.
+    """
+    return (ids >> 3) % processes
+
+
+def layered_bfs(worker_id, processes, inboxes, source, mode):
+    """
+    Runs the part of a breadth-first search that belongs to one worker process, one layer at a time. Each process
+    expands the states of the layer it owns, sends every new state to its owner and merges the states it receives
+    from all the processes into its part of the next layer. Along with the states, each process sends the size of the
+    part of the layer it expanded, so all of them know when the whole layer is empty and stop at the same layer.
+
+    :param worker_id: The index of this worker process.
+    :param processes: The number of worker processes.
+    :param inboxes: The queues the worker processes receive new states from, one for each of them.
+    :param source: The compact state ID the search begins from.
+    :param mode: Either 'reach' or 'distance'. See expand.
+    """
+    visited = _shared['visited']
+    distances = _shared['distances']
+    frontier = np.array([source], dtype=np.int64)
+    frontier = frontier[owner(frontier, processes) == worker_id]
+    set_bits(visited, frontier)
+    distances[frontier] = 0
+
+    # A process that is already one layer ahead may send its states before the ones of the current layer arrive
+    pending = [deque() for _ in range(processes)]
+    level = 0
+    while True:
+        new_ids = expand(frontier, mode)
+        owners = owner(new_ids, processes)
+        for other in range(processes):
+            if other != worker_id:
+                inboxes[other].put((worker_id, len(frontier), new_ids[owners == other]))
+
+        layer_size = len(frontier)
+        next_layer = [new_ids[owners == worker_id]]
+        for other in range(processes):
+            if other == worker_id:
+                continue
+            while not pending[other]:
+                sender, sender_layer_size, sender_ids = inboxes[worker_id].get()
+                pending[sender].append((sender_layer_size, sender_ids))
+            sender_layer_size, sender_ids = pending[other].popleft()
+            layer_size += sender_layer_size
+            next_layer.append(sender_ids)
+
+        if layer_size == 0:
+            return
+
+        frontier = np.unique(np.concatenate(next_layer))
+        frontier = frontier[~is_set(visited, frontier)]
+        level += 1
+        set_bits(visited, frontier)
+        distances[frontier] = level
+
+
+def run_worker(worker_id, processes, inboxes, commands, results, shared_arrays, problem):
+    """
+    The main loop of a worker process. It runs its part of every search it receives from the main process and
+    reports back when the search is over, until it receives None. If the search fails, the error is reported back
+    instead and the process exits.
+
+    :param worker_id: The index of this worker process.
+    :param processes: The number of worker processes.
+    :param inboxes: The queues the worker processes receive new states from, one for each of them.
+    :param commands: The queue this worker process receives the source and the mode of each search from.
+    :param results: The queue all the worker processes report finished searches to, along with the traceback of the
+                    error of a failed search or None.
+    :param shared_arrays: The reached, visited and distances shared arrays. See init_worker.
+    :param problem: The number of missionaries, cannibals and the boat capacity of the problem.
+    """
+    try:
+        init_worker(*shared_arrays, *problem)
+        for source, mode in iter(commands.get, None):
+            layered_bfs(worker_id, processes, inboxes, source, mode)
+            results.put((worker_id, None))
+    except Exception:
+        results.put((worker_id, format_exc()))
+
+
+def parallel_levels(missionaries=3, cannibals=3, boat_capacity=2, processes=None):
+    """
+    Explores the state space of the problem with a parallel breadth-first search, without building the problem graph.
+    It calculates the same node levels and straight distances to the goal as graph.problem_graph, indexed by the
+    compact state ID of each node. A first search finds the states that are part of the problem graph, then a search
+    from the root and another one from the goal calculate the distances.
+
+    The processes exchange their new states at the end of every layer and none of them can start the next layer
+    before all of them are done with the current one. The layers of these problems are narrow, only a few hundred
+    states wide even for thousands of missionaries and cannibals, so the exchange costs more than the expansion
+    itself and the search does not get faster with more processes. Unless the layers get much wider than that, a
+    single process is as fast as any other number of them.
+
+    :param missionaries: The number of missionaries of the problem. Default value = 3.
+    :param cannibals: The number of cannibals of the problem. Default value = 3.
+    :param boat_capacity: The max number of people the boat can carry on each crossing. Default value = 2.
+    :param processes: The number of worker processes. Default value = the number of CPUs.
+    :return: Tuple containing the level and the distance to the goal of each state. Both are -1 for the states that
+             are not part of the problem graph. The distances to the goal are all -1 if the goal can not be reached.
+    """
+    if processes is None:
+        processes = cpu_count()
+    if missionaries < 0 or cannibals < 0:
+        raise ValueError("The number of missionaries and cannibals can not be negative")
+    if boat_capacity < 1:
+        raise ValueError("The boat must be able to carry at least 1 person")
+    if processes < 1:
+        raise ValueError("There must be at least 1 worker process")
+
+    num_of_states = 2 * (missionaries + 1) * (cannibals + 1)
+    num_of_bytes = (num_of_states + 7) // 8
+    shared_arrays = (RawArray('B', num_of_bytes), RawArray('B', num_of_bytes), RawArray(c_int32, num_of_bytes * 8))
+    problem = (missionaries, cannibals, boat_capacity)
+    init_worker(*shared_arrays, *problem)
+
+    inboxes = [Queue() for _ in range(processes)]
+    commands = [Queue() for _ in range(processes)]
+    results = Queue()
+    workers = [Process(target=run_worker, daemon=True,
+                       args=(worker_id, processes, inboxes, commands[worker_id], results, shared_arrays, problem))
+               for worker_id in range(processes)]
+    for worker in workers:
+        worker.start()
+
+    def search(source, mode):
+        _shared['visited'][:] = 0
+        _shared['distances'][:] = -1
+        for command in commands:
+            command.put((source, mode))
+        for _ in workers:
+            # A worker that dies without reporting back would leave the others waiting for its states forever
+            while True:
+                try:
+                    worker_id, error = results.get(timeout=1)
+                    break
+                except Empty:
+                    for worker in workers:
+                        if not worker.is_alive():
+                            raise RuntimeError("Worker process exited with code {}".format(worker.exitcode))
+            if error is not None:
+                raise RuntimeError("Worker process {} failed:\n{}".format(worker_id, error))
+        return _shared['distances'][:num_of_states].copy()
+
+    root_id = root_state_id(missionaries, cannibals)
+    goal_id = 0
+    try:
+        in_graph = search(root_id, 'reach') >= 0
+        set_bits(_shared['reached'], np.flatnonzero(in_graph))
+
+        levels = search(root_id, 'distance')
+        if in_graph[goal_id]:
+            goal_distances = search(goal_id, 'distance')
+        else:
+            goal_distances = np.full(num_of_states, -1, dtype=np.int32)
+    except BaseException:
+        # The other workers may be blocked waiting for the states of a failed one
+        for worker in workers:
+            worker.terminate()
+        raise
+    finally:
+        for command in commands:
+            command.put(None)
+        for worker in workers:
+            worker.join()
+
+    return levels, goal_distances
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    problem = [int(arg) for arg in sys.argv[1:4]] or [3, 3, 2]
+    start_time = time.time()
+    node_levels, node_goal_distances = parallel_levels(*problem, *[int(arg) for arg in sys.argv[4:5]])
+    print("States: {} - Goal Level: {} - Depth: {} - {:.2f}s".format(
+        np.count_nonzero(node_levels >= 0), node_levels[0], node_levels.max(), time.time() - start_time))
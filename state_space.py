@@ -0,0 +1,89 @@
+import numpy as np
+
+
+# #################### Function declarations #################### #
+
+def state_id(_node, missionaries=3, cannibals=3):
+    """
+    Returns the compact state ID of a node of the problem graph. Since people of the same kind are interchangeable,
+    a state is fully described by the missionaries and cannibals on the starting bank and the bank that has the boat.
+    The IDs of all the states of a problem are the numbers 0 to 2 * (missionaries + 1) * (cannibals + 1) - 1.
+
+    :param _node: The node whose ID to return.
+    :param missionaries: The number of missionaries of the problem. Default value = 3.
+    :param cannibals: The number of cannibals of the problem. Default value = 3.
+    :return: The compact state ID of the node.
+    """
+    starting_bank = list(_node[0])
+    return ((starting_bank.count('m') * (cannibals + 1) + starting_bank.count('c')) * 2 +
+            (1 if 'b' in starting_bank else 0))
+
+
+def state_node(_state_id, missionaries=3, cannibals=3):
+    """
+    Returns the node of the problem graph for a compact state ID. It is the inverse of state_id.
+
+    :param _state_id: The compact state ID.
+    :param missionaries: The number of missionaries of the problem. Default value = 3.
+    :param cannibals: The number of cannibals of the problem. Default value = 3.
+    :return: The node in the same format as the nodes of graph.problem_graph.
+    """
+    _state_id = int(_state_id)
+    m, c = divmod(_state_id // 2, cannibals + 1)
+    boat_on_start = _state_id % 2 == 1
+    starting_bank = ['m'] * m + ['c'] * c + (['b'] if boat_on_start else [])
+    ending_bank = ['m'] * (missionaries - m) + ['c'] * (cannibals - c) + ([] if boat_on_start else ['b'])
+    return tuple(sorted(starting_bank)), tuple(sorted(ending_bank))
+
+
+def root_state_id(missionaries=3, cannibals=3):
+    """
+    Returns the compact state ID of the root node, where everyone is waiting on the starting bank with the boat.
+    The goal node always has the ID 0.
+
+    :param missionaries: The number of missionaries of the problem. Default value = 3.
+    :param cannibals: The number of cannibals of the problem. Default value = 3.
+    :return: The compact state ID of the root node.
+    """
+    return (missionaries * (cannibals + 1) + cannibals) * 2 + 1
+
+
+def is_bad(ids, missionaries, cannibals):
+    """
+    The vectorized equivalent of the flags set by graph.problem_graph. A state is bad if the cannibals outnumber the
+    missionaries on either bank. The goal state is never bad.
+
+    :param ids: The compact state IDs to check.
+    :param missionaries: The number of missionaries of the problem.
+    :param cannibals: The number of cannibals of the problem.
+    :return: A boolean array that is True for each bad state.
+    """
+    m, c = np.divmod(ids // 2, cannibals + 1)
+    return (((0 < m) & (m < c)) | ((0 < missionaries - m) & (missionaries - m < cannibals - c))) & (ids != 0)
+
+
+def apply_operators(frontier, missionaries, cannibals, boat_capacity):
+    """
+    Applies every applicable operator on every state of the frontier at once, one row per state and one column per
+    operator, the same way the cross_river of graph.problem_graph does for a single node.
+
+    :param frontier: The compact state IDs to apply the operators on.
+    :param missionaries: The number of missionaries of the problem.
+    :param cannibals: The number of cannibals of the problem.
+    :param boat_capacity: The max number of people the boat can carry on each crossing.
+    :return: Tuple containing the compact state IDs that result from the operators and the index of the frontier state
+             each one of them came from.
+    """
+    dm, dc = np.array([(dm, dc) for dm in range(boat_capacity + 1) for dc in range(boat_capacity + 1 - dm)
+                       if dm + dc > 0]).T
+    m, c = np.divmod(frontier // 2, cannibals + 1)
+    boat_on_start = frontier % 2 == 1
+    # Crossing from the starting bank removes people from it, crossing back adds them
+    sign = np.where(boat_on_start, -1, 1)[:, None]
+    m_with_boat = np.where(boat_on_start, m, missionaries - m)[:, None]
+    c_with_boat = np.where(boat_on_start, c, cannibals - c)[:, None]
+
+    applicable = (m_with_boat >= dm) & (c_with_boat >= dc)
+    new_ids = (((m[:, None] + sign * dm) * (cannibals + 1) + c[:, None] + sign * dc) * 2 +
+               (~boat_on_start)[:, None])[applicable]
+    return new_ids, np.nonzero(applicable)[0]
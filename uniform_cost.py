@@ -0,0 +1,165 @@
+from heapq import heappush, heappop
+
+import graph
+from a_star import heuristic
+
+
+# #################### Function declarations #################### #
+
+def rowing_costs(_g, rower_costs, passenger_cost=0):
+    """
+    Builds a cost function for each operator of the graph, where the crossing costs as much as the cheapest person in
+    the boat to row it, plus a fixed cost for every other person on board.
+
+    :param _g: The problem graph whose operators to build the cost functions for.
+    :param rower_costs: A dict with the cost of each type of person (e.x. {'m': 1, 'c': 2}) rowing the boat.
+    :param passenger_cost: The cost of carrying each person that does not row. Default value = 0.
+    :return: A dict with the operators as keys and their cost functions as values.
+    """
+    def cost_function(operator):
+        cost = min(rower_costs[person] for person in operator) + passenger_cost * (len(operator) - 1)
+        return lambda node_from, node_to: cost
+
+    return {operator: cost_function(operator) for operator in
+            set(edge[2]['operator'] for edge in _g.edges(data=True))}
+
+
+def crossing_cost(_g, node_from, node_to, cost_functions=None):
+    """
+    Returns the cost of crossing the river from one node to the other. The cost is kept separate from the edge
+    'weight', which is the straight distance to the goal used by the heuristic.
+
+    :param _g: The problem graph.
+    :param node_from: The node the boat leaves from.
+    :param node_to: The node the boat arrives to.
+    :param cost_functions: A dict with the operators as keys (e.x. ('c', 'm')) and functions accepting the node the
+                           boat leaves from and the node it arrives to and returning the cost of the crossing as
+                           values. Operators without a cost function cost 1, as in the A* of a_star.py.
+    :return: The cost of the crossing.
+    """
+    operator = _g[node_from][node_to]['operator']
+    if cost_functions is None or operator not in cost_functions:
+        return 1
+    return cost_functions[operator](node_from, node_to)
+
+
+def min_crossing_cost(_g, cost_functions=None):
+    """
+    Returns the cost of the cheapest crossing of the graph in any direction.
+
+    :param _g: The problem graph.
+    :param cost_functions: The cost functions of the operators. See crossing_cost.
+    :return: The cost of the cheapest crossing.
+    """
+    return min(min(crossing_cost(_g, u, v, cost_functions), crossing_cost(_g, v, u, cost_functions))
+               for u, v in _g.edges)
+
+
+def weighted_heuristic(_g, _node, cheapest_crossing):
+    """
+    Heuristic function that returns the least possible cost to reach the goal from the passed node. Every crossing
+    costs at least as much as the cheapest one and the goal is at least as many crossings away as its straight
+    distance. The heuristic is consistent, since a single crossing changes the straight distance by at most 1.
+
+    :param _g: The graph whose nodes to calculate the heuristic for.
+    :param _node: The node whose heuristic to calculate.
+    :param cheapest_crossing: The cost of the cheapest crossing as returned by min_crossing_cost.
+    :return: The straight distance of the node to the goal multiplied by the cost of the cheapest crossing.
+    """
+    return heuristic(_g, _node) * cheapest_crossing
+
+
+def weighted_a_star(_g, _node, cost_functions=None, use_heuristic=True, trace=True):
+    """
+    Run A* with weighted crossings against the passed graph starting with the passed node. The frontier is a binary
+    heap, where outdated entries are skipped when popped instead of being removed when a node's cost improves.
+
+    :param _g: The graph on which to run the A*.
+    :param _node: The node from which the A* search begins.
+    :param cost_functions: The cost functions of the operators. See crossing_cost.
+    :param use_heuristic: A flag indicating whether to use the weighted heuristic. Without it, the search is a uniform
+                          cost search (Dijkstra). Default value = True.
+    :param trace: A flag indicating whether to keep the steps the algorithm made. Copying the frontier and visited
+                  nodes on every step is quadratic, so it should be turned off for large graphs. Default value = True.
+    :return: The result path and the steps the algorithm made before reaching the goal node, in the same format as
+             the A* of a_star.py. The path is empty if the goal node can not be reached.
+    """
+    steps_to_solution = []
+    # Without a goal node the problem graph has no heuristic weights and there is nothing to search for
+    if not any(_g.nodes[node]['is_goal'] for node in _g.nodes):
+        return [], steps_to_solution
+
+    cheapest_crossing = min_crossing_cost(_g, cost_functions) if use_heuristic else 0
+
+    def estimate(node):
+        return weighted_heuristic(_g, node, cheapest_crossing) if use_heuristic else 0
+
+    visited = set()
+    frontier = {_node: 0}
+    origins = {}
+    queue = [(estimate(_node), _node)]
+
+    while queue:
+        _, current_node = heappop(queue)
+        if current_node in visited:
+            continue
+        distance_from_start = frontier.pop(current_node)
+
+        if _g.nodes[current_node]['is_goal']:
+            if trace:
+                steps_to_solution.append({'current_node': current_node, 'frontier': list(frontier),
+                                          'visited': list(visited)})
+            path = [current_node]
+            while current_node in origins.keys():
+                current_node = origins[current_node]
+                path.append(current_node)
+            return path, steps_to_solution
+
+        visited.add(current_node)
+
+        for neighbor in _g.neighbors(current_node):
+            if _g.nodes[neighbor]['is_bad'] or neighbor in visited:
+                continue
+
+            neighbor_distance_from_start = distance_from_start + crossing_cost(_g, current_node, neighbor,
+                                                                               cost_functions)
+            if neighbor in frontier and neighbor_distance_from_start >= frontier[neighbor]:
+                continue
+
+            origins[neighbor] = current_node
+            frontier[neighbor] = neighbor_distance_from_start
+            heappush(queue, (neighbor_distance_from_start + estimate(neighbor), neighbor))
+
+        if trace:
+            steps_to_solution.append({'current_node': current_node, 'frontier': list(frontier),
+                                      'visited': list(visited)})
+
+    return [], steps_to_solution
+
+
+def uniform_cost(_g, _node, cost_functions=None, trace=True):
+    """
+    Run a uniform cost search (Dijkstra) with weighted crossings against the passed graph starting with the passed
+    node.
+
+    :param _g: The graph on which to run the search.
+    :param _node: The node from which the search begins.
+    :param cost_functions: The cost functions of the operators. See crossing_cost.
+    :param trace: A flag indicating whether to keep the steps the algorithm made. Default value = True.
+    :return: The result path and the steps the algorithm made before reaching the goal node.
+    """
+    return weighted_a_star(_g, _node, cost_functions, use_heuristic=False, trace=trace)
+
+
+if __name__ == "__main__":
+    g, root_node = graph.problem_graph()
+    _, _, labels = graph.prepare_plot_data(g)
+
+    # Cannibals row twice as slow as missionaries and every passenger adds half a crossing to the cost
+    costs = rowing_costs(g, {'m': 1, 'c': 2}, passenger_cost=0.5)
+    for solver in (uniform_cost, weighted_a_star):
+        result, steps = solver(g, root_node, costs)
+        result = result[::-1]
+        print("{}: Cost {} - {} Steps: {}".format(
+            solver.__name__, sum(crossing_cost(g, u, v, costs) for u, v in zip(result, result[1:])), len(steps),
+            " -> ".join(labels[node] for node in result)))